@@ -0,0 +1,219 @@
+# src/analysis/_numba_kernels.py
+"""
+Compiled single-pass kernels backing the technical indicators.
+
+Numba is optional: when it is not installed the kernels run as plain
+Python loops with the same float64 accumulation, only slower.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator used when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, inline='always')
+def _rsi_value(avg_gain, avg_loss):
+    """
+    RSI from smoothed gain/loss: 100 when there were no losses, NaN when
+    the window was flat (no gains either), as 0/0 gives in pandas
+    """
+    if avg_loss == 0.0:
+        if avg_gain == 0.0:
+            return np.nan
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, inline='always')
+def _gain_loss(delta):
+    """
+    Split a price change into (gain, loss) branchlessly: for d, gain is
+    (d + |d|) / 2 and loss is (|d| - d) / 2, since the sign of d is
+    unpredictable in price series
+    """
+    abs_delta = abs(delta)
+    return 0.5 * (delta + abs_delta), 0.5 * (abs_delta - delta)
+
+
+@njit(cache=True, inline='always')
+def _wilder_step(avg_gain, avg_loss, delta, period):
+    """One step of Wilder's smoothing of the average gain and loss"""
+    gain, loss = _gain_loss(delta)
+    return ((avg_gain * (period - 1) + gain) / period,
+            (avg_loss * (period - 1) + loss) / period)
+
+
+@njit(cache=True)
+def wilder_rsi(close, period):
+    """
+    Relative Strength Index using Wilder's smoothing (RMA).
+
+    The averages are seeded with the simple mean of the first `period`
+    price changes and then updated recursively:
+    avg = (avg * (period - 1) + value) / period
+
+    A change involving a NaN price is skipped: it adds nothing to the seed
+    and leaves the averages untouched, and its bar gets a NaN RSI. Compiled
+    without fastmath so these NaN checks are not optimized away.
+
+    Args:
+        close: 1-D float32 or float64 array of closing prices; the running
+            averages are always accumulated in float64
+        period: Smoothing period
+
+    Returns:
+        Tuple of (RSI array with NaN for the first `period` entries,
+        final average gain, final average loss). The averages are NaN
+        when the series is too short to seed them.
+    """
+    n = close.shape[0]
+    out = np.empty(n, dtype=close.dtype)
+    out[:] = np.nan
+    if n <= period:
+        return out, np.nan, np.nan
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = float(close[i]) - float(close[i - 1])
+        if np.isnan(delta):
+            continue
+        gain, loss = _gain_loss(delta)
+        avg_gain += gain
+        avg_loss += loss
+    avg_gain /= period
+    avg_loss /= period
+    if not np.isnan(float(close[period]) - float(close[period - 1])):
+        out[period] = _rsi_value(avg_gain, avg_loss)
+
+    for i in range(period + 1, n):
+        delta = float(close[i]) - float(close[i - 1])
+        if np.isnan(delta):
+            continue
+        avg_gain, avg_loss = _wilder_step(avg_gain, avg_loss, delta, period)
+        out[i] = _rsi_value(avg_gain, avg_loss)
+    return out, avg_gain, avg_loss
+
+
+@njit(parallel=True, boundscheck=False, cache=True)
+def sma_simd(values, window, out):
+    """
+    Simple moving average written into a preallocated buffer.
+
+    The output is split into contiguous blocks processed in parallel; each
+    block seeds its window sum once and then slides it with one add and one
+    subtract per element. NaN inputs are kept out of the sum and counted
+    instead, so a window containing one is NaN and the average recovers as
+    soon as it leaves, as with pandas `rolling(window).mean()`.
+
+    Args:
+        values: 1-D float array
+        window: Number of observations in each window
+        out: Output array of the same length as `values`, NaN until the
+            window is full
+    """
+    n = values.shape[0]
+    out[:] = np.nan
+    if window < 1 or window > n:
+        return
+    n_out = n - window + 1
+    block = max(window * 4, 4096)
+    n_blocks = (n_out + block - 1) // block
+    for b in prange(n_blocks):
+        start = window - 1 + b * block
+        stop = min(start + block, n)
+        acc = 0.0
+        n_nan = 0
+        for j in range(start - window + 1, start + 1):
+            x = float(values[j])
+            if np.isnan(x):
+                n_nan += 1
+            else:
+                acc += x
+        if n_nan == 0:
+            out[start] = acc / window
+        for i in range(start + 1, stop):
+            x = float(values[i])
+            old = float(values[i - window])
+            if np.isnan(x):
+                n_nan += 1
+            else:
+                acc += x
+            if np.isnan(old):
+                n_nan -= 1
+            else:
+                acc -= old
+            if n_nan == 0:
+                out[i] = acc / window
+
+
+@njit(cache=True, inline='always')
+def _ewm_step(value, weight, x, alpha):
+    """
+    One step of pandas `ewm(adjust=False)` with NaN handling.
+
+    `weight` is the relative weight of the current average; it decays by
+    (1 - alpha) per bar, including bars whose observation is NaN, and is
+    reset to 1 after each valid observation.
+
+    Returns:
+        Tuple of the new (average, weight)
+    """
+    if np.isnan(x):
+        if not np.isnan(value):
+            weight *= 1.0 - alpha
+        return value, weight
+    if np.isnan(value):
+        return x, 1.0
+    weight *= 1.0 - alpha
+    return (weight * value + alpha * x) / (weight + alpha), 1.0
+
+
+@njit(cache=True)
+def macd_kernel(close, a_fast, a_slow, a_sig, macd_out, sig_out):
+    """
+    Fused MACD: fast EMA, slow EMA, their difference and the signal EMA.
+
+    Matches pandas `ewm(span=..., adjust=False)` with smoothing factors
+    alpha = 2 / (span + 1), computed in a single pass over `close`. NaN
+    prices are skipped the way pandas does: the averages carry over and
+    the gap decays their weight. Compiled without fastmath so the NaN
+    checks are kept.
+
+    Args:
+        close: 1-D float array of closing prices
+        a_fast: Smoothing factor of the fast EMA
+        a_slow: Smoothing factor of the slow EMA
+        a_sig: Smoothing factor of the signal line
+        macd_out: Output array for the MACD line
+        sig_out: Output array for the signal line
+
+    Returns:
+        Tuple of the final (fast EMA, slow EMA, fast weight, slow weight),
+        with NaN averages when no price was valid
+    """
+    ema_fast = np.nan
+    ema_slow = np.nan
+    w_fast = 1.0
+    w_slow = 1.0
+    signal = np.nan
+    w_sig = 1.0
+    for i in range(close.shape[0]):
+        x = float(close[i])
+        ema_fast, w_fast = _ewm_step(ema_fast, w_fast, x, a_fast)
+        ema_slow, w_slow = _ewm_step(ema_slow, w_slow, x, a_slow)
+        macd = ema_fast - ema_slow
+        signal, w_sig = _ewm_step(signal, w_sig, macd, a_sig)
+        macd_out[i] = macd
+        sig_out[i] = signal
+    return ema_fast, ema_slow, w_fast, w_slow
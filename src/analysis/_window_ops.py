@@ -0,0 +1,111 @@
+# src/analysis/_window_ops.py
+"""
+Vectorized rolling-window helpers shared by the technical indicators.
+"""
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.analysis._numba_kernels import NUMBA_AVAILABLE, sma_simd
+
+
+def sliding_weighted_ma(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted moving average over a sliding window.
+
+    Builds a zero-copy strided view of all windows and reduces it with a
+    single matrix-vector product, replacing `rolling(...).apply(...)`.
+    Weights are normalized to sum to one and apply oldest-to-newest, so
+    WMA, TRIMA or ALMA only differ in the weight vector passed in.
+
+    Args:
+        values: 1-D array of observations
+        weights: 1-D array of window weights, oldest observation first
+
+    Returns:
+        Float array aligned with `values`, NaN until the window is full
+    """
+    values = np.asarray(values, dtype=np.float64)
+    w = np.array(weights, dtype=values.dtype)
+    if w.ndim != 1 or w.size == 0:
+        raise ValueError("Weights must be a non-empty 1-D array")
+    w /= w.sum()
+
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= w.size:
+        windows = sliding_window_view(values, w.size)
+        out[w.size - 1:] = windows @ w
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Simple moving average in one pass.
+
+    Uses the compiled sma_simd kernel when numba is available, otherwise
+    window differences of a float64 prefix sum. Windows containing a NaN
+    are NaN on both paths.
+
+    Args:
+        values: 1-D float array
+        window: Number of observations in each window
+        out: Optional buffer to write into instead of allocating one
+
+    Returns:
+        Array in the dtype of `values` (or of `out`), NaN until the window
+        is full
+    """
+    values = np.ascontiguousarray(values)
+    if out is None:
+        out = np.empty_like(values)
+    if NUMBA_AVAILABLE:
+        sma_simd(values, window, out)
+        return out
+
+    out[:] = np.nan
+    if 1 <= window <= values.shape[0]:
+        missing = np.isnan(values)
+        ps = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values),
+                                              dtype=np.float64)))
+        means = (ps[window:] - ps[:-window]) / window
+        if missing.any():
+            # NaNs are summed as zero, so mask windows that contained one
+            n_missing = np.concatenate(([0], np.cumsum(missing)))
+            means[n_missing[window:] != n_missing[:-window]] = np.nan
+        out[window - 1:] = means
+    return out
+
+
+def rolling_mean_std(values: np.ndarray, window: int):
+    """
+    Rolling mean and sample standard deviation (ddof=1) together.
+
+    Both come from window averages of x and x**2 in float64. Computed on
+    raw prices, E[x^2] - E[x]^2 cancels badly once prices are large
+    compared with their spread, so the series is first shifted by its
+    first valid value (variance is shift-invariant) and the offset is
+    added back to the mean.
+
+    Args:
+        values: 1-D float array
+        window: Number of observations in each window
+
+    Returns:
+        Tuple of float64 (mean, std) arrays, NaN until the window is full
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    offset = values[valid[0]] if valid.size else 0.0
+    shifted = values - offset
+    mean = rolling_mean(shifted, window)
+    std = np.full(values.shape[0], np.nan)
+    if 1 < window <= values.shape[0]:
+        mean_sq = rolling_mean(shifted * shifted, window)[window - 1:]
+        tail = mean[window - 1:]
+        # Rounding can still push a flat window slightly below zero
+        var = np.maximum(mean_sq - tail * tail, 0.0) * window / (window - 1)
+        std[window - 1:] = np.sqrt(var)
+    mean += offset
+    return mean, std
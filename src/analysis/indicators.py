@@ -1,7 +1,16 @@
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass
-from typing import Dict, Any
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Mapping
+from src.analysis._numba_kernels import (
+    _ewm_step, _gain_loss, _rsi_value, _wilder_step, macd_kernel, wilder_rsi
+)
+from src.analysis._window_ops import rolling_mean, rolling_mean_std
+
+# pandas < 3 copies every block in concat unless told not to; pandas >= 3
+# does not copy here (copy-on-write) and deprecates the argument
+_CONCAT_NO_COPY = {'copy': False} if int(pd.__version__.split('.')[0]) < 3 else {}
 
 @dataclass
 class IndicatorConfig:
@@ -9,51 +18,286 @@ class IndicatorConfig:
     enabled: Dict[str, bool]
     parameters: Dict[str, Any]
 
+@dataclass
+class _RSIState:
+    """Running state of Wilder's RSI"""
+    period: int
+    prev_close: float = np.nan
+    avg_gain: float = 0.0
+    avg_loss: float = 0.0
+    count: int = 0  # Number of price changes seen
+    started: bool = False
+    
+    def step(self, close: float) -> float:
+        """
+        Advance by one bar and return the new RSI value.
+        
+        Uses the same scalar helpers as wilder_rsi, so update() follows the
+        bulk kernel exactly, including skipped NaN changes.
+        """
+        if not self.started:
+            self.started = True
+            self.prev_close = close
+            return np.nan
+        delta = close - self.prev_close
+        self.prev_close = close
+        self.count += 1
+        missing = np.isnan(delta)
+        if self.count <= self.period:
+            # Seed phase: sum the first changes, then take their mean
+            if not missing:
+                gain, loss = _gain_loss(delta)
+                self.avg_gain += gain
+                self.avg_loss += loss
+            if self.count < self.period:
+                return np.nan
+            self.avg_gain /= self.period
+            self.avg_loss /= self.period
+        elif not missing:
+            self.avg_gain, self.avg_loss = _wilder_step(
+                self.avg_gain, self.avg_loss, delta, self.period)
+        if missing:
+            return np.nan
+        return _rsi_value(self.avg_gain, self.avg_loss)
+
+@dataclass
+class _EMAState:
+    """Running state of an exponential moving average (adjust=False)"""
+    alpha: float
+    value: float = np.nan
+    weight: float = 1.0  # Relative weight of `value`, decayed over NaN gaps
+    
+    def step(self, x: float) -> float:
+        """Advance by one observation and return the new average"""
+        self.value, self.weight = _ewm_step(self.value, self.weight, x, self.alpha)
+        return self.value
+
+@dataclass
+class _SMAState:
+    """
+    Running window sums for simple moving averages and rolling std.
+    
+    The sums are of x - offset, where offset is the first valid value seen,
+    so the variance term does not cancel on large prices (as in
+    rolling_mean_std).
+    """
+    window: int
+    values: deque = field(default_factory=deque)
+    total: float = 0.0
+    total_sq: float = 0.0
+    n_nan: int = 0  # NaNs in the window, which are left out of the sums
+    offset: float = np.nan
+    
+    def _add(self, x: float, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one observation from the sums"""
+        if np.isnan(x):
+            self.n_nan += sign
+            return
+        if np.isnan(self.offset):
+            self.offset = x
+        dev = x - self.offset
+        self.total += sign * dev
+        self.total_sq += sign * dev * dev
+    
+    def step(self, x: float) -> float:
+        """Slide the window by one observation and return the new mean"""
+        if len(self.values) == self.window:
+            self._add(self.values.popleft(), -1)
+        self.values.append(x)
+        self._add(x, 1)
+        if len(self.values) < self.window or self.n_nan:
+            return np.nan
+        return self.offset + self.total / self.window
+    
+    def std(self) -> float:
+        """Sample standard deviation of the current window"""
+        if len(self.values) < self.window or self.window < 2 or self.n_nan:
+            return np.nan
+        mean = self.total / self.window
+        var = max(self.total_sq / self.window - mean * mean, 0.0)
+        return np.sqrt(var * self.window / (self.window - 1))
+    
+    @classmethod
+    def seed(cls, close: np.ndarray, window: int) -> '_SMAState':
+        """Build the state from the tail of a price history"""
+        tail = close[-window:].astype(np.float64)
+        missing = np.isnan(tail)
+        valid = tail[~missing]
+        offset = float(valid[0]) if valid.size else np.nan
+        dev = valid - offset
+        return cls(window, deque(tail.tolist()), float(dev.sum()),
+                   float((dev * dev).sum()), int(missing.sum()), offset)
+
 class TechnicalIndicators:
     """Calculates various technical indicators"""
     
+    # Columns produced by each indicator, in output order
+    OUTPUT_COLUMNS = {
+        'rsi': ['RSI'],
+        'moving_averages': ['MA_Short', 'MA_Long'],
+        'bollinger_bands': ['BB_Upper', 'BB_Lower'],
+        'macd': ['MACD', 'Signal_Line']
+    }
+    
     def __init__(self, data: pd.DataFrame, config: IndicatorConfig):
-        self.data = data.copy()
+        # The input frame is only read; results go to a separate block
+        self.data = data
         self.config = config
+        self._index = data.index
+        self._close = None
+        self._state: Dict[str, Any] = {}
+        self._out = None
+        self._out_columns: Dict[str, int] = {}
     
     def calculate_enabled_indicators(self) -> pd.DataFrame:
-        """Calculate all enabled indicators"""
-        for indicator, enabled in self.config.enabled.items():
-            if enabled:
-                method_name = f'_calculate_{indicator}'
-                if hasattr(self, method_name):
-                    getattr(self, method_name)()
-                else:
-                    raise ValueError(f"No calculation method for {indicator}")
+        """
+        Calculate all enabled indicators.
+        
+        Indicator values are written into one preallocated column-major
+        block in the price dtype and joined to the input frame at the end,
+        instead of copying the whole OHLCV frame up front.
+        
+        Returns:
+            New DataFrame with the input columns followed by the indicators
+        """
+        enabled = [name for name, on in self.config.enabled.items() if on]
+        for indicator in enabled:
+            if not hasattr(self, f'_calculate_{indicator}'):
+                raise ValueError(f"No calculation method for {indicator}")
+        
+        columns = [col for name in enabled for col in self.OUTPUT_COLUMNS.get(name, [])]
+        self._out_columns = {col: i for i, col in enumerate(columns)}
+        self._out = np.empty((len(self._index), len(columns)),
+                             dtype=self._close_array().dtype, order='F')
+        
+        for indicator in enabled:
+            getattr(self, f'_calculate_{indicator}')()
+        
+        overlap = [col for col in columns if col in self.data.columns]
+        base = self.data.drop(columns=overlap) if overlap else self.data
+        self.data = pd.concat(
+            [base, pd.DataFrame(self._out, index=self._index, columns=columns, copy=False)],
+            axis=1, **_CONCAT_NO_COPY
+        )
         return self.data
     
+    def _column(self, name: str) -> np.ndarray:
+        """Contiguous view of an output column in the preallocated block"""
+        return self._out[:, self._out_columns[name]]
+    
+    def update(self, new_row: Mapping[str, Any]) -> pd.Series:
+        """
+        Advance every calculated indicator by a single new bar in O(1).
+        
+        Must be called after calculate_enabled_indicators(), which seeds the
+        running state. self.data is not extended; callers append the
+        returned row themselves if they need the full history.
+        
+        Args:
+            new_row: Mapping (e.g. a Series named by its timestamp) with at
+                least a 'Close' entry
+                
+        Returns:
+            Series with the new bar's values and its indicator columns
+        """
+        if not self._state:
+            raise ValueError("Indicators must be calculated before update()")
+        
+        close = float(new_row['Close'])
+        values = dict(new_row)
+        
+        if 'rsi' in self._state:
+            values['RSI'] = self._state['rsi'].step(close)
+        
+        if 'moving_averages' in self._state:
+            short, long_ = self._state['moving_averages']
+            values['MA_Short'] = short.step(close)
+            values['MA_Long'] = long_.step(close)
+        
+        if 'bollinger_bands' in self._state:
+            bands = self._state['bollinger_bands']
+            mean = bands.step(close)
+            width = bands.std() * self.config.parameters['bollinger_bands']['std_dev']
+            values['BB_Upper'] = mean + width
+            values['BB_Lower'] = mean - width
+        
+        if 'macd' in self._state:
+            fast, slow, signal = self._state['macd']
+            macd = fast.step(close) - slow.step(close)
+            values['MACD'] = macd
+            values['Signal_Line'] = signal.step(macd)
+        
+        return pd.Series(values, name=getattr(new_row, 'name', None))
+    
     def _calculate_rsi(self) -> None:
-        """Calculate Relative Strength Index"""
+        """Calculate Relative Strength Index using Wilder's smoothing"""
         params = self.config.parameters['rsi']
-        delta = self.data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(params['period']).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(params['period']).mean()
-        rs = gain / loss
-        self.data['RSI'] = 100 - (100 / (1 + rs))
+        period = int(params['period'])
+        close = self._close_array()
+        rsi, avg_gain, avg_loss = wilder_rsi(close, period)
+        self._column('RSI')[:] = rsi
+        
+        if len(close) > period:
+            self._state['rsi'] = _RSIState(period, float(close[-1]), avg_gain,
+                                           avg_loss, len(close) - 1, True)
+        else:
+            state = _RSIState(period)
+            for price in close:
+                state.step(float(price))
+            self._state['rsi'] = state
     
     def _calculate_moving_averages(self) -> None:
         """Calculate moving averages"""
         params = self.config.parameters['moving_averages']
-        self.data['MA_Short'] = self.data['Close'].rolling(params['short_window']).mean()
-        self.data['MA_Long'] = self.data['Close'].rolling(params['long_window']).mean()
+        short_window = int(params['short_window'])
+        long_window = int(params['long_window'])
+        close = self._close_array()
+        rolling_mean(close, short_window, out=self._column('MA_Short'))
+        rolling_mean(close, long_window, out=self._column('MA_Long'))
+        self._state['moving_averages'] = (
+            _SMAState.seed(close, short_window),
+            _SMAState.seed(close, long_window)
+        )
+    
+    def _close_array(self) -> np.ndarray:
+        """
+        Cache a contiguous Close array for the kernels.
+        
+        float32 input stays at single precision, which halves the memory
+        traffic of the RSI, MA and MACD passes; other dtypes become float64.
+        Bollinger bands widen to float64 only inside rolling_mean_std.
+        """
+        if self._close is None:
+            close = self.data['Close'].to_numpy()
+            if close.dtype != np.float32:
+                close = close.astype(np.float64)
+            self._close = np.ascontiguousarray(close)
+        return self._close
     
     def _calculate_bollinger_bands(self) -> None:
         """Calculate Bollinger Bands"""
         params = self.config.parameters['bollinger_bands']
-        rolling_mean = self.data['Close'].rolling(params['window']).mean()
-        rolling_std = self.data['Close'].rolling(params['window']).std()
-        self.data['BB_Upper'] = rolling_mean + (rolling_std * params['std_dev'])
-        self.data['BB_Lower'] = rolling_mean - (rolling_std * params['std_dev'])
+        window = int(params['window'])
+        rolling_mu, rolling_sd = rolling_mean_std(self._close_array(), window)
+        self._column('BB_Upper')[:] = rolling_mu + (rolling_sd * params['std_dev'])
+        self._column('BB_Lower')[:] = rolling_mu - (rolling_sd * params['std_dev'])
+        self._state['bollinger_bands'] = _SMAState.seed(self._close_array(), window)
     
     def _calculate_macd(self) -> None:
         """Calculate MACD"""
         params = self.config.parameters['macd']
-        exp1 = self.data['Close'].ewm(span=params['fast_period'], adjust=False).mean()
-        exp2 = self.data['Close'].ewm(span=params['slow_period'], adjust=False).mean()
-        self.data['MACD'] = exp1 - exp2
-        self.data['Signal_Line'] = self.data['MACD'].ewm(span=params['signal_period'], adjust=False).mean()
\ No newline at end of file
+        close = self._close_array()
+        alphas = [2.0 / (params[key] + 1)
+                  for key in ('fast_period', 'slow_period', 'signal_period')]
+        signal_line = self._column('Signal_Line')
+        ema_fast, ema_slow, w_fast, w_slow = macd_kernel(
+            close, *alphas, self._column('MACD'), signal_line)
+        
+        # MACD is only NaN before the first valid price, so the signal
+        # line never has a gap and its weight stays 1
+        last_signal = float(signal_line[-1]) if len(signal_line) else np.nan
+        self._state['macd'] = (
+            _EMAState(alphas[0], ema_fast, w_fast),
+            _EMAState(alphas[1], ema_slow, w_slow),
+            _EMAState(alphas[2], last_signal)
+        )
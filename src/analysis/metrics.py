@@ -1,34 +1,82 @@
 # src/analysis/metrics.py
 import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Union
 import logging
 
 class FinancialMetrics:
     """
     Calculates various financial performance metrics from return series.
     Includes risk-adjusted returns, drawdown metrics, and performance ratios.
+    
+    A DataFrame of returns is treated as independent series, one per column,
+    and every metric becomes a Series indexed by the columns.
     """
     
-    def __init__(self, returns: pd.Series, risk_free_rate: float = 0.02):
+    def __init__(self, returns: Union[pd.Series, pd.DataFrame],
+                 risk_free_rate: float = 0.02):
         """
         Initialize with return series and optional risk-free rate.
         
         Args:
-            returns: Pandas Series of asset returns
+            returns: Pandas Series of asset returns, or a DataFrame with one
+                return series per column (rows with any NaN are dropped)
             risk_free_rate: Annualized risk-free rate (default 2%)
         """
         self.returns = returns.dropna()
         self.risk_free_rate = risk_free_rate
         self.logger = logging.getLogger(__name__)
+        self._r = self.returns.to_numpy(dtype=np.float64)
+        self._cache: Dict[str, Any] = {}
+    
+    def _wrap(self, value: Any) -> Any:
+        """Scalar for a single series, Series indexed by column otherwise"""
+        if self._r.ndim == 1:
+            return np.asarray(value)[()]
+        return pd.Series(value, index=self.returns.columns)
+        
+    def _stats(self) -> Dict[str, Any]:
+        """
+        Compute the shared intermediate quantities once and cache them.
+        
+        All reductions run along axis 0, so a 2-D return array yields one
+        value per column.
+        
+        Returns:
+            Dictionary with mean, std, downside std, equity curve,
+            running peak and maximum drawdown of the return series
+        """
+        if not self._cache:
+            r = self._r
+            n = r.shape[0]
+            missing = np.full(r.shape[1:], np.nan)
+            down = r < 0
+            n_downside = down.sum(axis=0)
+            cumulative = np.cumprod(1.0 + r, axis=0)
+            peak = np.maximum.accumulate(cumulative, axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                down_mean = np.where(down, r, 0.0).sum(axis=0) / n_downside
+                down_var = (np.where(down, r - down_mean, 0.0) ** 2).sum(axis=0) / (n_downside - 1)
+            self._cache = {
+                'mu': r.mean(axis=0) if n else missing,
+                'sigma': r.std(axis=0, ddof=1) if n > 1 else missing,
+                'downside_sigma': np.where(n_downside > 1, np.sqrt(down_var), np.nan),
+                'n_downside': n_downside,
+                'cumulative': cumulative,
+                'peak': peak,
+                'dd_min': ((cumulative - peak) / peak).min(axis=0) if n else missing
+            }
+        return self._cache
         
-    def calculate_all(self) -> Dict[str, float]:
+    def calculate_all(self) -> Dict[str, Any]:
         """
         Calculate and return all available metrics.
         
         Returns:
-            Dictionary of metric names and values
+            Dictionary of metric names and values (Series per metric for
+            DataFrame input)
         """
+        self._stats()
         return {
             'total_return': self.total_return(),
             'annualized_return': self.annualized_return(),
@@ -45,60 +93,61 @@ class FinancialMetrics:
     
     def total_return(self) -> float:
         """Calculate cumulative return for entire period"""
-        return (1 + self.returns).prod() - 1
+        cumulative = self._stats()['cumulative']
+        if not cumulative.shape[0]:
+            return self._wrap(np.zeros(cumulative.shape[1:]))
+        return self._wrap(cumulative[-1] - 1)
     
     def annualized_return(self, periods_per_year: int = 252) -> float:
         """Calculate annualized return"""
-        return (1 + self.returns.mean())**periods_per_year - 1
+        return self._wrap((1 + self._stats()['mu'])**periods_per_year - 1)
     
     def annualized_volatility(self, periods_per_year: int = 252) -> float:
         """Calculate annualized volatility"""
-        return self.returns.std() * np.sqrt(periods_per_year)
+        return self._wrap(self._stats()['sigma'] * np.sqrt(periods_per_year))
     
     def sharpe_ratio(self, periods_per_year: int = 252) -> float:
         """Calculate annualized Sharpe ratio"""
-        excess_returns = self.returns - (self.risk_free_rate / periods_per_year)
-        return excess_returns.mean() / excess_returns.std() * np.sqrt(periods_per_year)
+        stats = self._stats()
+        excess_mean = stats['mu'] - (self.risk_free_rate / periods_per_year)
+        return self._wrap(excess_mean / stats['sigma'] * np.sqrt(periods_per_year))
     
     def sortino_ratio(self, periods_per_year: int = 252) -> float:
         """Calculate annualized Sortino ratio"""
-        downside_returns = self.returns[self.returns < 0]
-        if len(downside_returns) == 0:
-            return np.nan
-        downside_std = downside_returns.std()
-        excess_returns = self.returns - (self.risk_free_rate / periods_per_year)
-        return excess_returns.mean() / downside_std * np.sqrt(periods_per_year)
+        stats = self._stats()
+        excess_mean = stats['mu'] - (self.risk_free_rate / periods_per_year)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = excess_mean / stats['downside_sigma'] * np.sqrt(periods_per_year)
+        return self._wrap(np.where(stats['n_downside'] == 0, np.nan, ratio))
     
     def max_drawdown(self) -> float:
         """Calculate maximum drawdown"""
-        cumulative = (1 + self.returns).cumprod()
-        peak = cumulative.expanding(min_periods=1).max()
-        drawdown = (cumulative - peak) / peak
-        return drawdown.min()
+        return self._wrap(self._stats()['dd_min'])
     
     def calmar_ratio(self, periods_per_year: int = 252) -> float:
         """Calculate Calmar ratio (annualized return / max drawdown)"""
-        max_dd = abs(self.max_drawdown())
-        if max_dd == 0:
-            return np.nan
-        return self.annualized_return(periods_per_year) / max_dd
+        max_dd = np.abs(self._stats()['dd_min'])
+        annualized = np.asarray(self.annualized_return(periods_per_year))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = annualized / max_dd
+        return self._wrap(np.where(max_dd == 0, np.nan, ratio))
     
     def win_rate(self) -> float:
         """Calculate percentage of positive return periods"""
-        return (self.returns > 0).mean()
+        return self._wrap(np.asarray((self.returns > 0).mean()))
     
     def profit_factor(self) -> float:
         """Calculate profit factor (gross profits / gross losses)"""
-        gross_profits = self.returns[self.returns > 0].sum()
-        gross_losses = abs(self.returns[self.returns < 0].sum())
-        if gross_losses == 0:
-            return np.inf
-        return gross_profits / gross_losses
+        gross_profits = np.where(self._r > 0, self._r, 0.0).sum(axis=0)
+        gross_losses = np.abs(np.where(self._r < 0, self._r, 0.0).sum(axis=0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = gross_profits / gross_losses
+        return self._wrap(np.where(gross_losses == 0, np.inf, ratio))
     
     def skewness(self) -> float:
         """Calculate return distribution skewness"""
-        return self.returns.skew()
+        return self._wrap(np.asarray(self.returns.skew()))
     
     def kurtosis(self) -> float:
         """Calculate return distribution kurtosis"""
-        return self.returns.kurtosis()
\ No newline at end of file
+        return self._wrap(np.asarray(self.returns.kurtosis()))
@@ -1,9 +1,11 @@
 # src/analysis/visualization.py
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 import seaborn as sns  # Add this import
 import logging
+from src.trading.signals import SIMPLE_SIGNAL_CATEGORIES, simple_signal_codes
 
 class TradingVisualizer:
     """Handles visualization of trading results"""
@@ -49,15 +51,21 @@ class TradingVisualizer:
         """Plot price data with trading signals"""
         ax.plot(data['Close'], label='Price')
         
+        # Resolve signal positions once on the raw arrays
+        dates = data.index.to_numpy()
+        close = data['Close'].to_numpy()
+        # STRONG_* signals are marked as BUY/SELL; missing values get no marker
+        codes = simple_signal_codes(signals['primary'])
+        buys = np.flatnonzero(codes == SIMPLE_SIGNAL_CATEGORIES.index('BUY'))
+        sells = np.flatnonzero(codes == SIMPLE_SIGNAL_CATEGORIES.index('SELL'))
+        
         # Plot buy signals
-        buy_signals = signals['primary'] == 'BUY'
-        if any(buy_signals):
-            ax.plot(data.loc[buy_signals, 'Close'], '^', markersize=10, color='g', label='Buy')
+        if buys.size:
+            ax.scatter(dates[buys], close[buys], marker='^', s=100, c='g', label='Buy')
         
         # Plot sell signals
-        sell_signals = signals['primary'] == 'SELL'
-        if any(sell_signals):
-            ax.plot(data.loc[sell_signals, 'Close'], 'v', markersize=10, color='r', label='Sell')
+        if sells.size:
+            ax.scatter(dates[sells], close[sells], marker='v', s=100, c='r', label='Sell')
         
         ax.set_title(f'{ticker} Price with Signals')
         ax.set_ylabel('Price')
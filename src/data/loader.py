@@ -7,6 +7,17 @@ import logging
 class FinancialDataLoader:
     """Loads financial data from various sources"""
     
+    # Explicit column types so the CSV reader skips type inference; only
+    # these columns (plus Date) are parsed, the rest of the file is skipped.
+    # Keys are the capitalized names; headers in the file may use any case
+    SCHEMA = {
+        'Open': 'float32',
+        'High': 'float32',
+        'Low': 'float32',
+        'Close': 'float32',
+        'Volume': 'float64'  # Float so blank cells load as NaN for the processor
+    }
+    
     def __init__(self, data_dir: str = 'data/raw'):
         self.data_dir = Path(data_dir)
         self.logger = logging.getLogger(__name__)
@@ -20,14 +31,21 @@ class FinancialDataLoader:
             raise FileNotFoundError(f"Data file not found: {file_path}")
             
         try:
+            # Match header names case-insensitively; columns missing from the
+            # file are left for the caller's required-column check
+            header = pd.read_csv(file_path, nrows=0).columns
+            names = {name.capitalize(): name for name in header}
+            dtype = {names[col]: kind for col, kind in self.SCHEMA.items() if col in names}
             data = pd.read_csv(
                 file_path,
-                parse_dates=['Date'],
-                index_col='Date'
+                engine='pyarrow',
+                dtype=dtype,
+                usecols=[names[col] for col in ['Date', *self.SCHEMA] if col in names],
+                parse_dates=[names['Date']] if 'Date' in names else False
             )
             # Ensure standard column names
             data.columns = data.columns.str.capitalize()
-            return data
+            return data.set_index('Date')
             
         except Exception as e:
             self.logger.error(f"Failed to load {ticker} data: {str(e)}")
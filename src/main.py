@@ -4,10 +4,15 @@ Quantitative Financial Analysis System - Complete Implementation
 """
 
 import argparse
+import hashlib
 import logging
+import multiprocessing
+import os
 import yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+import numpy as np
 import pandas as pd
 import matplotlib
 import matplotlib.pyplot as plt
@@ -18,9 +23,17 @@ from src.data.loader import FinancialDataLoader
 from src.data.processor import DataProcessor
 from src.analysis.indicators import TechnicalIndicators, IndicatorConfig
 from src.analysis.metrics import FinancialMetrics
-from src.trading.signals import SignalType, SignalGenerator, SignalConfig
-from src.trading.backtesting import Backtester
+from src.trading.signals import SignalGenerator, SignalConfig, simple_signal_codes
+from src.trading.backtesting import SIGNAL_DTYPE, Backtester
 from src.analysis.visualization import TradingVisualizer
+from src.analysis import _numba_kernels, _window_ops, indicators
+from src.analysis._numba_kernels import NUMBA_AVAILABLE
+from src.data import loader, processor
+
+# Part of the indicator cache key. Bump it when the cached frame layout
+# changes; edits to the modules below invalidate the cache on their own.
+INDICATOR_CACHE_VERSION = 1
+_INDICATOR_CACHE_MODULES = (loader, processor, indicators, _window_ops, _numba_kernels)
 
 def validate_directory(path: str) -> Path:
     """Ensure output directory exists"""
@@ -161,6 +174,52 @@ class FinancialAnalysisSystem:
             self.logger.error(f"Indicator calculation failed: {str(e)}")
             raise
     
+    def _indicator_cache_path(self, ticker: str) -> Optional[Path]:
+        """
+        Locate the on-disk indicator cache for a ticker.
+        
+        The file name hashes the cache version, the source of the modules
+        that build the frame, the indicator config and the raw CSV's
+        modification time, so changing any of them invalidates the entry.
+        
+        Returns:
+            Cache file path, or None when caching is disabled or the raw
+            file is missing
+        """
+        raw_path = Path(self.args.data_dir) / f"{ticker}.csv"
+        if self.args.no_cache or not raw_path.exists():
+            return None
+        
+        key = hashlib.sha256()
+        key.update(str(INDICATOR_CACHE_VERSION).encode('utf-8'))
+        for module in _INDICATOR_CACHE_MODULES:
+            key.update(Path(module.__file__).read_bytes())
+        key.update(yaml.dump(self.config['indicators'], sort_keys=True).encode('utf-8'))
+        key.update(str(raw_path.stat().st_mtime_ns).encode('utf-8'))
+        return Path(self.args.cache_dir) / f"{ticker}_{key.hexdigest()[:16]}.parquet"
+    
+    def _read_indicator_cache(self, cache_path: Optional[Path]) -> Optional[pd.DataFrame]:
+        """Load cached indicator data, or None on a cache miss"""
+        if cache_path is None or not cache_path.exists():
+            return None
+        try:
+            data = pd.read_parquet(cache_path)
+            self.logger.info(f"Loaded cached indicators from {cache_path}")
+            return data
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable indicator cache {cache_path}: {str(e)}")
+            return None
+    
+    def _write_indicator_cache(self, cache_path: Optional[Path], data: pd.DataFrame) -> None:
+        """Persist indicator data for later runs; failures are not fatal"""
+        if cache_path is None:
+            return
+        try:
+            validate_directory(str(cache_path.parent))
+            data.to_parquet(cache_path)
+        except Exception as e:
+            self.logger.warning(f"Could not write indicator cache {cache_path}: {str(e)}")
+    
     def _generate_signals(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Generate trading signals"""
         self.logger.info("Generating trading signals")
@@ -185,8 +244,15 @@ class FinancialAnalysisSystem:
         """Calculate performance metrics"""
         self.logger.info("Calculating performance metrics")
         try:
-            returns = data['Close'].pct_change().dropna()
-            metrics = FinancialMetrics(returns, risk_free_rate=self.config['backtesting'].get('risk_free_rate', 0.02))
+            # Simple returns in one pass, defined as in the backtester so the
+            # buy-and-hold and strategy metrics are comparable
+            close = data['Close'].to_numpy(dtype=np.float64)
+            simple = np.divide(close[1:], close[:-1])
+            simple -= 1.0
+            metrics = FinancialMetrics(
+                pd.Series(simple, index=data.index[1:]),
+                risk_free_rate=self.config['backtesting'].get('risk_free_rate', 0.02)
+            )
             return metrics.calculate_all()
         except Exception as e:
             self.logger.error(f"Metrics calculation failed: {str(e)}")
@@ -196,21 +262,12 @@ class FinancialAnalysisSystem:
         """Execute backtesting"""
         self.logger.info("Running backtest")
         try:
-            # Convert SignalType enum to strings
-            signal_mapping = {
-                'BUY': 'BUY',
-                'SELL': 'SELL',
-                'STRONG_BUY': 'BUY',
-                'STRONG_SELL': 'SELL',
-                'NEUTRAL': 'NEUTRAL'
-            }
-        
-            # Handle both enum and string signal types
-            if isinstance(signals['primary'].iloc[0], SignalType):
-                signal_series = signals['primary'].map(lambda x: signal_mapping[x.name])
-            else:
-                # Fallback if signals are already strings
-                signal_series = signals['primary'].map(signal_mapping.get, na_action='ignore')
+            # Collapse STRONG_* into BUY/SELL; missing values are rejected by the backtester
+            primary = signals['primary']
+            signal_series = pd.Series(
+                pd.Categorical.from_codes(simple_signal_codes(primary), dtype=SIGNAL_DTYPE),
+                index=primary.index
+            )
         
             backtester = Backtester(
                 prices=data['Close'],
@@ -264,53 +321,100 @@ class FinancialAnalysisSystem:
             self.logger.error(f"Visualization failed: {str(e)}")
             raise
     
+    def _process_ticker(self, ticker: str) -> Dict[str, Any]:
+        """Run the full pipeline for a single ticker"""
+        self.logger.info(f"\n{'='*40}\nProcessing {ticker}\n{'='*40}")
+        
+        cache_path = self._indicator_cache_path(ticker)
+        tech_data = self._read_indicator_cache(cache_path)
+        
+        if tech_data is None:
+            # 1. Data Loading
+            raw_data = self._load_data(ticker)
+            
+            # 2. Data Processing
+            processed_data = self._process_data(raw_data)
+            
+            # 3. Technical Analysis
+            tech_data = self._calculate_indicators(processed_data)
+            self._write_indicator_cache(cache_path, tech_data)
+        
+        # 4. Signal Generation
+        signals = self._generate_signals(tech_data)
+        
+        # 5. Performance Metrics
+        metrics = self._calculate_metrics(tech_data, signals)
+        
+        # 6. Backtesting
+        backtest_results = self._run_backtest(tech_data, signals)
+        
+        # 7. Visualization
+        self._visualize_results(
+            ticker,
+            tech_data,
+            signals,
+            metrics,
+            backtest_results
+        )
+        
+        return {
+            'data': tech_data,
+            'signals': signals,
+            'metrics': metrics,
+            'backtest': backtest_results
+        }
+    
     def run_pipeline(self):
         """Execute complete analysis pipeline"""
         results = {}
+        tickers = list(self.args.tickers)
+        workers = min(self.args.workers or os.cpu_count() or 1, len(tickers))
         
-        for ticker in self.args.tickers:
-            try:
-                self.logger.info(f"\n{'='*40}\nProcessing {ticker}\n{'='*40}")
-                
-                # 1. Data Loading
-                raw_data = self._load_data(ticker)
-                
-                # 2. Data Processing
-                processed_data = self._process_data(raw_data)
-                
-                # 3. Technical Analysis
-                tech_data = self._calculate_indicators(processed_data)
-                
-                # 4. Signal Generation
-                signals = self._generate_signals(tech_data)
-                
-                # 5. Performance Metrics
-                metrics = self._calculate_metrics(tech_data, signals)
-                
-                # 6. Backtesting
-                backtest_results = self._run_backtest(tech_data, signals)
-                
-                # 7. Visualization
-                self._visualize_results(
-                    ticker,
-                    tech_data,
-                    signals,
-                    metrics,
-                    backtest_results
-                )
-                
-                results[ticker] = {
-                    'data': tech_data,
-                    'signals': signals,
-                    'metrics': metrics,
-                    'backtest': backtest_results
-                }
-                
-            except Exception as e:
-                self.logger.error(f"Failed processing {ticker}: {str(e)}", exc_info=True)
-                continue
-                
-        return results
+        if workers <= 1:
+            for ticker in tickers:
+                try:
+                    results[ticker] = self._process_ticker(ticker)
+                except Exception as e:
+                    self.logger.error(f"Failed processing {ticker}: {str(e)}", exc_info=True)
+            return results
+        
+        # Tickers are independent, so each one runs in its own process.
+        # Workers are spawned rather than forked: numba's TBB threading
+        # layer is not fork-safe once the parent has used it.
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(self.args.verbose,)) as executor:
+            futures = {
+                executor.submit(_process_ticker_worker, self.args, ticker): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    results[ticker] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Failed processing {ticker}: {str(e)}", exc_info=True)
+        
+        # Report in the order the tickers were requested
+        return {ticker: results[ticker] for ticker in tickers if ticker in results}
+
+def _init_worker(verbose: bool) -> None:
+    """
+    Process pool initializer.
+    
+    Spawned workers do not inherit the logging setup, so it is repeated.
+    Numba's parallel kernels are limited to one thread per worker, since
+    the pool already uses every core.
+    """
+    setup_logging(verbose)
+    if NUMBA_AVAILABLE:
+        import numba
+        numba.set_num_threads(1)
+
+def _process_ticker_worker(args, ticker: str) -> Dict[str, Any]:
+    """Process pool entry point: build a system in the worker and run one ticker"""
+    return FinancialAnalysisSystem(args)._process_ticker(ticker)
 
 def parse_arguments():
     """Parse command line arguments"""
@@ -323,6 +427,12 @@ def parse_arguments():
                       help='Output directory for results')
     parser.add_argument('--data-dir', type=str, default='data/raw',
                       help='Directory containing raw data files')
+    parser.add_argument('--cache-dir', type=str, default='.cache/indicators',
+                      help='Directory for cached indicator data')
+    parser.add_argument('--no-cache', action='store_true',
+                      help='Always recompute indicators instead of using the cache')
+    parser.add_argument('--workers', type=int, default=None,
+                      help='Number of tickers processed in parallel (default: CPU count)')
     parser.add_argument('--verbose', action='store_true',
                       help='Enable verbose logging')
     return parser.parse_args()
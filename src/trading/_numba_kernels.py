@@ -0,0 +1,123 @@
+# src/trading/_numba_kernels.py
+"""
+Compiled sequential kernels for the backtesting engine.
+"""
+import numpy as np
+
+from src.analysis._numba_kernels import NUMBA_AVAILABLE, njit, prange
+
+
+@njit(cache=True, fastmath=False)
+def _positions_from_signals(codes):
+    """
+    Run the position state machine over int8 signal codes.
+
+    Args:
+        codes: int8 array with BUY=1, SELL=-1, NEUTRAL=0
+
+    Returns:
+        int8 array of positions (1=long, -1=short, 0=neutral)
+    """
+    n = codes.shape[0]
+    out = np.empty(n, dtype=np.int8)
+    pos = 0
+    for i in range(n):
+        code = codes[i]
+        if code == 1 and pos <= 0:
+            pos = 1
+        elif code == -1 and pos >= 0:
+            pos = -1
+        out[i] = pos
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _positions_from_signals_2d(codes):
+    """
+    Position state machine over a (T, K) block of signal codes.
+
+    Each column is an independent signal series and is processed in
+    parallel with the same rules as `_positions_from_signals`.
+
+    Args:
+        codes: (T, K) int8 array with BUY=1, SELL=-1, NEUTRAL=0
+
+    Returns:
+        (T, K) int8 array of positions (1=long, -1=short, 0=neutral)
+    """
+    n, k = codes.shape
+    out = np.empty((n, k), dtype=np.int8)
+    for j in prange(k):
+        pos = 0
+        for i in range(n):
+            code = codes[i, j]
+            if code == 1 and pos <= 0:
+                pos = 1
+            elif code == -1 and pos >= 0:
+                pos = -1
+            out[i, j] = pos
+    return out
+
+
+@njit(cache=True)
+def _combine_signals(ma_short, ma_long, rsi, close, bb_upper, bb_lower, macd,
+                     signal_line, rsi_overbought, rsi_oversold, use_ma, use_rsi,
+                     use_bb, use_macd):
+    """
+    Evaluate every signal rule in a single pass and emit int8 signal codes.
+
+    Codes are STRONG_SELL=-2, SELL=-1, NEUTRAL=0, BUY=1, STRONG_BUY=2.
+    Arrays of disabled indicators are never read and may be empty; their
+    conditions count as False. Compiled without fastmath so comparisons
+    against NaN warm-up values stay False, as they are in pandas.
+
+    Returns:
+        int8 array of signal codes aligned with `close`
+    """
+    n = close.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+    for i in range(n):
+        cross_above = False
+        cross_below = False
+        if use_ma and i > 0:
+            cross_above = ma_short[i] > ma_long[i] and ma_short[i - 1] <= ma_long[i - 1]
+            cross_below = ma_short[i] < ma_long[i] and ma_short[i - 1] >= ma_long[i - 1]
+
+        overbought = False
+        oversold = False
+        if use_rsi:
+            overbought = rsi[i] > rsi_overbought
+            oversold = rsi[i] < rsi_oversold
+
+        below_lower = False
+        above_upper = False
+        if use_bb:
+            below_lower = close[i] < bb_lower[i]
+            above_upper = close[i] > bb_upper[i]
+
+        macd_above = False
+        macd_below = False
+        if use_macd and i > 0:
+            macd_above = macd[i] > signal_line[i] and macd[i - 1] <= signal_line[i - 1]
+            macd_below = macd[i] < signal_line[i] and macd[i - 1] >= signal_line[i - 1]
+
+        strong_buy = cross_above and oversold and below_lower and macd_above
+        strong_sell = cross_below and overbought and above_upper and macd_below
+
+        # Later rules take precedence, matching the original assignment order
+        code = 0
+        if strong_buy:
+            code = 2
+        if strong_sell:
+            code = -2
+        if (cross_above or macd_above) and not strong_buy:
+            code = 1
+        if (cross_below or macd_below) and not strong_sell:
+            code = -1
+        out[i] = code
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from cache) at import instead of on the first backtest
+    _positions_from_signals(np.zeros(1, dtype=np.int8))
@@ -1,9 +1,26 @@
 # src/trading/backtesting.py
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 from src.analysis.metrics import FinancialMetrics  # Add this import
+from src.trading._numba_kernels import (
+    NUMBA_AVAILABLE, _positions_from_signals, _positions_from_signals_2d
+)
+from src.trading.signals import SIMPLE_SIGNAL_CATEGORIES
+
+# Fixed signal categories, ordered so that `codes - 1` gives -1/0/1
+SIGNAL_DTYPE = pd.CategoricalDtype(SIMPLE_SIGNAL_CATEGORIES)
+
+
+def _signal_codes(signals: pd.Series) -> np.ndarray:
+    """int8 category codes of signals under SIGNAL_DTYPE, -1 for any other value"""
+    if isinstance(signals.dtype, pd.CategoricalDtype):
+        # Only the categories need looking up, not every value
+        mapping = SIGNAL_DTYPE.categories.get_indexer(signals.cat.categories)
+        # Trailing -1 so missing values (code -1) also map to -1
+        return np.append(mapping, -1)[signals.cat.codes.to_numpy()].astype(np.int8)
+    return SIGNAL_DTYPE.categories.get_indexer(signals).astype(np.int8)
 
 class Backtester:
     """
@@ -11,17 +28,27 @@ class Backtester:
     Calculates performance metrics, position tracking, and risk management.
     """
     
-    def __init__(self, prices: pd.Series, signals: pd.Series, config: Dict[str, Any]):
+    def __init__(self, prices: pd.Series, signals: Optional[pd.Series],
+                 config: Dict[str, Any]):
         """
         Initialize backtester with price data, signals, and configuration.
         
         Args:
             prices: Series of asset prices
-            signals: Series of trading signals (BUY/SELL/NEUTRAL)
+            signals: Series of trading signals (BUY/SELL/NEUTRAL), or None
+                when only run_batch() will be used
             config: Dictionary of backtesting parameters
         """
         self.prices = prices
-        self.signals = signals
+        # Signals are coded against the fixed categories once here, so run()
+        # only checks a flag instead of scanning the values
+        self.signals = None
+        self._invalid_signals = False
+        if signals is not None:
+            codes = _signal_codes(signals)
+            self._invalid_signals = bool((codes < 0).any())
+            self.signals = pd.Series(pd.Categorical.from_codes(codes, dtype=SIGNAL_DTYPE),
+                                     index=signals.index, name=signals.name)
         self.config = {
             'initial_capital': 100000,
             'commission': 0.001,  # 0.1% commission
@@ -55,77 +82,167 @@ class Backtester:
             'metrics': self._calculate_performance_metrics(returns)
         }
     
+    def run_batch(self, signals_df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Backtest several signal series against the same prices at once.
+        
+        Each column of `signals_df` is an independent parameterization
+        (e.g. one point of an indicator parameter sweep). Positions, returns
+        and metrics are computed on (T, K) arrays instead of K separate runs.
+        The signals passed to the constructor, if any, are not used.
+        
+        Args:
+            signals_df: DataFrame of BUY/SELL/NEUTRAL signals, one column per
+                parameterization, aligned with the prices
+        
+        Returns:
+            Dictionary containing:
+            - returns: DataFrame of strategy returns per column
+            - positions: DataFrame of positions per column
+            - metrics: DataFrame with the same metrics as run(), one row
+              per column
+        """
+        if len(signals_df) != len(self.prices):
+            raise ValueError("Prices and signals must have same length")
+        
+        if not isinstance(self.prices.index, pd.DatetimeIndex):
+            raise ValueError("Prices must have datetime index")
+        
+        codes = np.empty(signals_df.shape, dtype=np.int8)
+        for j, column in enumerate(signals_df.columns):
+            codes[:, j] = _signal_codes(signals_df[column])
+        if (codes < 0).any():
+            raise ValueError("Signals must be BUY/SELL/NEUTRAL")
+        codes -= 1
+        
+        if NUMBA_AVAILABLE:
+            positions = _positions_from_signals_2d(codes)
+        else:
+            last = np.where(codes != 0, np.arange(codes.shape[0])[:, None], 0)
+            np.maximum.accumulate(last, axis=0, out=last)
+            positions = np.take_along_axis(codes, last, axis=0)
+        
+        prices = self.prices.to_numpy(dtype=np.float64)
+        price_returns = np.divide(prices[1:], prices[:-1])
+        price_returns -= 1.0
+        returns = positions[:-1] * price_returns[:, None]
+        changes = np.abs(np.diff(positions, axis=0))
+        returns -= changes * self.config['commission']
+        
+        valid = ~np.isnan(price_returns)
+        returns = returns[valid]
+        
+        returns = pd.DataFrame(returns, index=self.prices.index[1:][valid],
+                               columns=signals_df.columns)
+        metrics = FinancialMetrics(returns, self.config['risk_free_rate'])
+        
+        return {
+            'returns': returns,
+            'positions': pd.DataFrame(positions, index=self.prices.index,
+                                      columns=signals_df.columns),
+            'metrics': pd.DataFrame(metrics.calculate_all())
+        }
+    
     def _validate_inputs(self) -> None:
         """Validate input data and signals"""
+        if self.signals is None:
+            raise ValueError("Signals are required for run(); use run_batch() otherwise")
+        
         if len(self.prices) != len(self.signals):
             raise ValueError("Prices and signals must have same length")
         
         if not isinstance(self.prices.index, pd.DatetimeIndex):
             raise ValueError("Prices must have datetime index")
             
-        if not all(s in ['BUY', 'SELL', 'NEUTRAL'] for s in self.signals.unique()):
+        if self._invalid_signals:
             raise ValueError("Signals must be BUY/SELL/NEUTRAL")
     
     def _generate_positions(self) -> pd.Series:
-        """Generate position series from signals"""
-        positions = pd.Series(0, index=self.prices.index)
-        position = 0  # Current position (1=long, -1=short, 0=neutral)
-        
-        for i, (date, signal) in enumerate(self.signals.items()):
-            if signal == 'BUY' and position <= 0:
-                positions.iloc[i] = 1
-                position = 1
-            elif signal == 'SELL' and position >= 0:
-                positions.iloc[i] = -1
-                position = -1
-            else:
-                positions.iloc[i] = position
-                
-        return positions
+        """
+        Generate position series from signals.
+        
+        A position is only changed by a BUY or SELL and is otherwise carried
+        forward, so the position at each bar is the most recent non-neutral
+        signal (1=long, -1=short, 0=neutral before the first one).
+        """
+        codes = (self.signals.cat.codes.to_numpy() - 1).astype(np.int8)
+        
+        if NUMBA_AVAILABLE:
+            positions = _positions_from_signals(codes)
+        else:
+            # Forward-fill the last non-neutral code via a running max of its index
+            last = np.where(codes != 0, np.arange(len(codes)), 0)
+            np.maximum.accumulate(last, out=last)
+            positions = codes[last]
+        
+        return pd.Series(positions, index=self.prices.index)
     
     def _calculate_returns(self, positions: pd.Series) -> pd.Series:
-        """Calculate strategy returns including commissions"""
-        price_returns = self.prices.pct_change()
-        strategy_returns = positions.shift(1) * price_returns
+        """
+        Calculate strategy returns including commissions.
+        
+        For bar t >= 1: pos[t-1] * (p[t] / p[t-1] - 1) - |pos[t] - pos[t-1]| * commission,
+        evaluated in place on the underlying arrays.
+        """
+        prices = self.prices.to_numpy(dtype=np.float64)
+        pos = positions.to_numpy().astype(np.int8)
         
-        # Apply commissions on position changes
-        position_changes = positions.diff().abs()
-        commissions = position_changes * self.config['commission']
-        strategy_returns -= commissions
+        strategy_returns = np.divide(prices[1:], prices[:-1])
+        strategy_returns -= 1.0
+        strategy_returns *= pos[:-1]
         
-        return strategy_returns.dropna()
+        # Apply commissions on position changes, kept as int8 (at most 2)
+        # until they are scaled
+        changes = np.abs(np.diff(pos))
+        strategy_returns -= changes * self.config['commission']
+        
+        returns = pd.Series(strategy_returns, index=self.prices.index[1:])
+        if np.isnan(strategy_returns).any():
+            returns = returns.dropna()
+        return returns
     
     def _generate_trade_history(self, positions: pd.Series) -> pd.DataFrame:
-        """Generate detailed trade history"""
-        trades = []
-        position = 0
-        entry_price = None
-        entry_date = None
-        
-        for date, pos in positions.items():
-            if pos != position:  # Position changed
-                if position != 0:  # Exit previous position
-                    exit_price = self.prices[date]
-                    pct_change = (exit_price - entry_price) / entry_price * position
-                    trades.append({
-                        'entry_date': entry_date,
-                        'exit_date': date,
-                        'position': position,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'return': pct_change,
-                        'duration': (date - entry_date).days
-                    })
-                
-                if pos != 0:  # Enter new position
-                    entry_price = self.prices[date]
-                    entry_date = date
-                
-                position = pos
-        
-        return pd.DataFrame(trades)
+        """
+        Generate detailed trade history.
+        
+        Every position change closes the open trade (if any) and opens a new
+        one (unless flat); a trade still open on the last bar is not recorded.
+        """
+        pos = positions.to_numpy().astype(np.int8)
+        prices_arr = self.prices.to_numpy(dtype=np.float64)
+        dates_arr = self.prices.index.to_numpy()
+        
+        # Bars where the position changes; each trade runs from one change to the next
+        change_idx = np.flatnonzero(np.diff(pos, prepend=0) != 0)
+        entry_idx = change_idx[:-1]
+        exit_idx = change_idx[1:]
+        held = pos[entry_idx] != 0
+        entry_idx = entry_idx[held]
+        exit_idx = exit_idx[held]
+        
+        # Column arrays (struct-of-arrays), each gathered or computed once
+        direction = pos[entry_idx]
+        entry_prices = prices_arr[entry_idx]
+        exit_prices = prices_arr[exit_idx]
+        trade_returns = np.empty(entry_idx.size, dtype=np.float64)
+        np.subtract(exit_prices, entry_prices, out=trade_returns)
+        np.divide(trade_returns, entry_prices, out=trade_returns)
+        np.multiply(trade_returns, direction, out=trade_returns)
+        entry_dates = dates_arr[entry_idx]
+        exit_dates = dates_arr[exit_idx]
+        durations = (exit_dates - entry_dates).astype('timedelta64[D]').astype(np.int64)
+        
+        return pd.DataFrame({
+            'entry_date': pd.DatetimeIndex(entry_dates),
+            'exit_date': pd.DatetimeIndex(exit_dates),
+            'position': direction,
+            'entry_price': entry_prices,
+            'exit_price': exit_prices,
+            'return': trade_returns,
+            'duration': durations
+        }, copy=False)
     
     def _calculate_performance_metrics(self, returns: pd.Series) -> Dict[str, float]:
         """Calculate performance metrics from returns"""
         metrics = FinancialMetrics(returns, self.config['risk_free_rate'])
-        return metrics.calculate_all()
\ No newline at end of file
+        return metrics.calculate_all()
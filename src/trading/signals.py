@@ -3,6 +3,9 @@ import numpy as np
 from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from enum import Enum, auto
+from src.analysis._numba_kernels import macd_kernel, wilder_rsi
+from src.analysis._window_ops import rolling_mean, rolling_mean_std
+from src.trading._numba_kernels import _combine_signals
 
 class SignalType(Enum):
     """Enumeration of possible signal types"""
@@ -22,6 +25,53 @@ class SignalType(Enum):
             SignalType.STRONG_BUY: 'BUY',
             SignalType.STRONG_SELL: 'SELL'
         }[self]
+
+# Category for each int8 signal code, indexed by code + 2
+SIGNAL_CATEGORIES = [
+    SignalType.STRONG_SELL.name,
+    SignalType.SELL.name,
+    SignalType.NEUTRAL.name,
+    SignalType.BUY.name,
+    SignalType.STRONG_BUY.name
+]
+
+# Simple signal names, ordered so that `code - 1` gives SELL=-1/NEUTRAL=0/BUY=1
+SIMPLE_SIGNAL_CATEGORIES = ['SELL', 'NEUTRAL', 'BUY']
+
+# SIMPLE_SIGNAL_CATEGORIES code for each SIGNAL_CATEGORIES code, plus a
+# trailing -1 so that missing values (code -1) stay missing
+_SIMPLE_CODES = np.array(
+    [SIMPLE_SIGNAL_CATEGORIES.index(SignalType[name].simple_name) for name in SIGNAL_CATEGORIES] + [-1],
+    dtype=np.int8
+)
+
+# Simple name of every SignalType, keyed by the member and by its name
+_SIMPLE_NAMES = {
+    **{signal: signal.simple_name for signal in SignalType},
+    **{signal.name: signal.simple_name for signal in SignalType}
+}
+
+def simple_signal_codes(signals: pd.Series) -> np.ndarray:
+    """
+    Collapse signals into simple BUY/SELL/NEUTRAL codes.
+    
+    STRONG_* signals count as BUY/SELL, as in `SignalType.simple_name`.
+    Accepts the Categorical returned by `SignalGenerator.generate_signals`,
+    SignalType values or their names.
+    
+    Args:
+        signals: Series of trading signals
+        
+    Returns:
+        int8 codes into SIMPLE_SIGNAL_CATEGORIES, -1 for missing or
+        unknown values
+    """
+    if (isinstance(signals.dtype, pd.CategoricalDtype)
+            and list(signals.cat.categories) == SIGNAL_CATEGORIES):
+        return _SIMPLE_CODES[signals.cat.codes.to_numpy()]
+    simple = signals.map(_SIMPLE_NAMES)
+    return pd.Index(SIMPLE_SIGNAL_CATEGORIES).get_indexer(simple).astype(np.int8)
+
 @dataclass
 class SignalConfig:
     """Configuration for signal generation with validation"""
@@ -96,90 +146,78 @@ class SignalGenerator:
     
     def _precompute_indicators(self) -> None:
         """Precompute all technical indicators needed for signals"""
-        # RSI
+        close = self.data['Close'].to_numpy()
+        if close.dtype != np.float32:
+            close = close.astype(np.float64)
+        
+        # RSI (Wilder's smoothing, one pass)
         if self.config.enabled.get('rsi', False):
             params = self.config.parameters['rsi']
-            delta = self.data['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(params['period']).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(params['period']).mean()
-            rs = gain / loss
-            self.data['RSI'] = 100 - (100 / (1 + rs))
+            self.data['RSI'] = wilder_rsi(close, int(params['period']))[0]
         
         # Moving Averages
         if self.config.enabled.get('moving_average', False):
             params = self.config.parameters['moving_average']
-            self.data['MA_Short'] = self.data['Close'].rolling(params['short_window']).mean()
-            self.data['MA_Long'] = self.data['Close'].rolling(params['long_window']).mean()
+            self.data['MA_Short'] = rolling_mean(close, int(params['short_window']))
+            self.data['MA_Long'] = rolling_mean(close, int(params['long_window']))
         
-        # Bollinger Bands
+        # Bollinger Bands (mean and std from the same window sums)
         if self.config.enabled.get('bollinger', False):
             params = self.config.parameters['bollinger']
-            rolling_mean = self.data['Close'].rolling(params['window']).mean()
-            rolling_std = self.data['Close'].rolling(params['window']).std()
-            self.data['BB_Upper'] = rolling_mean + (rolling_std * params['std_dev'])
-            self.data['BB_Lower'] = rolling_mean - (rolling_std * params['std_dev'])
+            rolling_mu, rolling_sd = rolling_mean_std(close, int(params['window']))
+            self.data['BB_Upper'] = rolling_mu + (rolling_sd * params['std_dev'])
+            self.data['BB_Lower'] = rolling_mu - (rolling_sd * params['std_dev'])
         
-        # MACD
+        # MACD (fast/slow EMA, difference and signal EMA in one pass)
         if self.config.enabled.get('macd', False):
             params = self.config.parameters['macd']
-            exp1 = self.data['Close'].ewm(span=params['fast_period'], adjust=False).mean()
-            exp2 = self.data['Close'].ewm(span=params['slow_period'], adjust=False).mean()
-            self.data['MACD'] = exp1 - exp2
-            self.data['Signal_Line'] = self.data['MACD'].ewm(span=params['signal_period'], adjust=False).mean()
+            macd = np.empty_like(close)
+            signal_line = np.empty_like(close)
+            macd_kernel(
+                close,
+                2.0 / (params['fast_period'] + 1),
+                2.0 / (params['slow_period'] + 1),
+                2.0 / (params['signal_period'] + 1),
+                macd,
+                signal_line
+            )
+            self.data['MACD'] = macd
+            self.data['Signal_Line'] = signal_line
     
     def generate_signals(self) -> pd.Series:
         """
         Generate comprehensive trading signals based on multiple indicators.
         
         Returns:
-            Series of SignalType enum values
+            Categorical Series of SignalType names, backed by int8 codes
         """
-        signals = pd.Series(SignalType.NEUTRAL, index=self.data.index, name='Signal')
-        
-        # Initialize conditions
-        ma_cross_above = False
-        ma_cross_below = False
-        rsi_overbought = False
-        rsi_oversold = False
-        price_below_bb_lower = False
-        price_above_bb_upper = False
-        macd_above_signal = False
-        macd_below_signal = False
-        
-        # Calculate conditions only for enabled indicators
-        if self.config.enabled.get('moving_average', False):
-            ma_cross_above = (self.data['MA_Short'] > self.data['MA_Long']) & \
-                           (self.data['MA_Short'].shift(1) <= self.data['MA_Long'].shift(1))
-            ma_cross_below = (self.data['MA_Short'] < self.data['MA_Long']) & \
-                           (self.data['MA_Short'].shift(1) >= self.data['MA_Long'].shift(1))
-        
-        if self.config.enabled.get('rsi', False):
-            params = self.config.parameters['rsi']
-            rsi_overbought = self.data['RSI'] > params['overbought']
-            rsi_oversold = self.data['RSI'] < params['oversold']
+        enabled = self.config.enabled
+        use_ma = enabled.get('moving_average', False)
+        use_rsi = enabled.get('rsi', False)
+        use_bb = enabled.get('bollinger', False)
+        use_macd = enabled.get('macd', False)
+        rsi_params = self.config.parameters.get('rsi', {}) if use_rsi else {}
         
-        if self.config.enabled.get('bollinger', False):
-            price_below_bb_lower = self.data['Close'] < self.data['BB_Lower']
-            price_above_bb_upper = self.data['Close'] > self.data['BB_Upper']
-        
-        if self.config.enabled.get('macd', False):
-            macd_above_signal = (self.data['MACD'] > self.data['Signal_Line']) & \
-                              (self.data['MACD'].shift(1) <= self.data['Signal_Line'].shift(1))
-            macd_below_signal = (self.data['MACD'] < self.data['Signal_Line']) & \
-                              (self.data['MACD'].shift(1) >= self.data['Signal_Line'].shift(1))
+        # Disabled indicators are passed as empty arrays and never read
+        empty = np.empty(0, dtype=np.float64)
         
-        # Combined signals
-        strong_buy = ma_cross_above & rsi_oversold & price_below_bb_lower & macd_above_signal
-        strong_sell = ma_cross_below & rsi_overbought & price_above_bb_upper & macd_below_signal
-        buy = ma_cross_above | macd_above_signal
-        sell = ma_cross_below | macd_below_signal
+        def column(name: str, used: bool) -> np.ndarray:
+            return self.data[name].to_numpy() if used else empty
         
-        signals.loc[strong_buy] = SignalType.STRONG_BUY
-        signals.loc[strong_sell] = SignalType.STRONG_SELL
-        signals.loc[buy & ~strong_buy] = SignalType.BUY
-        signals.loc[sell & ~strong_sell] = SignalType.SELL
+        codes = _combine_signals(
+            column('MA_Short', use_ma), column('MA_Long', use_ma),
+            column('RSI', use_rsi), self.data['Close'].to_numpy(),
+            column('BB_Upper', use_bb), column('BB_Lower', use_bb),
+            column('MACD', use_macd), column('Signal_Line', use_macd),
+            float(rsi_params.get('overbought', 70)), float(rsi_params.get('oversold', 30)),
+            bool(use_ma), bool(use_rsi), bool(use_bb), bool(use_macd)
+        )
         
-        return signals
+        return pd.Series(
+            pd.Categorical.from_codes(codes + 2, categories=SIGNAL_CATEGORIES),
+            index=self.data.index,
+            name='Signal'
+        )
     
     def generate_all_signals(self) -> Dict[str, Any]:
         """
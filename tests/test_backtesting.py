@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading import backtesting
+from src.trading.backtesting import Backtester
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+    index = pd.date_range('2020-01-01', periods=len(close), freq='B')
+    return pd.Series(close.astype(np.float32), index=index, name='Close')
+
+
+@pytest.fixture
+def signals(prices):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        f'sweep_{k}': rng.choice(['BUY', 'SELL', 'NEUTRAL'], len(prices), p=[0.05, 0.05, 0.9])
+        for k in range(4)
+    }, index=prices.index)
+
+
+class TestBacktester:
+    @pytest.mark.parametrize('numba', [True, False])
+    def test_positions_carry_last_signal(self, monkeypatch, prices, numba):
+        monkeypatch.setattr(backtesting, 'NUMBA_AVAILABLE', numba)
+        signals = pd.Series(['NEUTRAL', 'BUY', 'NEUTRAL', 'SELL', 'NEUTRAL', 'BUY'],
+                            index=prices.index[:6])
+        result = Backtester(prices.iloc[:6], signals, {}).run()
+        assert result['positions'].tolist() == [0, 1, 1, -1, -1, 1]
+        assert result['trades']['position'].tolist() == [1, -1]
+
+    def test_rejects_unknown_signals(self, prices):
+        signals = pd.Series('HOLD', index=prices.index)
+        with pytest.raises(ValueError):
+            Backtester(prices, signals, {}).run()
+
+    def test_run_requires_signals(self, prices):
+        with pytest.raises(ValueError):
+            Backtester(prices, None, {}).run()
+
+    @pytest.mark.parametrize('numba', [True, False])
+    def test_run_batch_matches_run(self, monkeypatch, prices, signals, numba):
+        monkeypatch.setattr(backtesting, 'NUMBA_AVAILABLE', numba)
+        batch = Backtester(prices, None, {}).run_batch(signals)
+
+        for column in signals.columns:
+            single = Backtester(prices, signals[column], {}).run()
+            np.testing.assert_array_equal(batch['positions'][column], single['positions'])
+            np.testing.assert_allclose(batch['returns'][column], single['returns'])
+            assert batch['metrics'].loc[column].to_dict() == pytest.approx(single['metrics'])
+
+    def test_run_batch_rejects_unknown_signals(self, prices, signals):
+        signals.iloc[10, 0] = 'HOLD'
+        with pytest.raises(ValueError):
+            Backtester(prices, None, {}).run_batch(signals)
+
+    @pytest.mark.parametrize('values', [[np.nan] * 3, ['BUY', np.nan, 'SELL']])
+    def test_rejects_missing_categorical_signals(self, prices, values):
+        signals = pd.Series(pd.Categorical(values), index=prices.index[:3])
+        with pytest.raises(ValueError):
+            Backtester(prices.iloc[:3], signals, {}).run()
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis import _window_ops
+from src.analysis._numba_kernels import wilder_rsi
+from src.analysis.indicators import IndicatorConfig, TechnicalIndicators, _RSIState, _SMAState
+
+CONFIG = IndicatorConfig(
+    enabled={
+        'rsi': True,
+        'moving_averages': True,
+        'bollinger_bands': True,
+        'macd': True
+    },
+    parameters={
+        'rsi': {'period': 14},
+        'moving_averages': {'short_window': 20, 'long_window': 50},
+        'bollinger_bands': {'window': 20, 'std_dev': 2.0},
+        'macd': {'fast_period': 12, 'slow_period': 26, 'signal_period': 9}
+    }
+)
+
+COLUMNS = ['RSI', 'MA_Short', 'MA_Long', 'BB_Upper', 'BB_Lower', 'MACD', 'Signal_Line']
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, 300))
+    index = pd.date_range('2020-01-01', periods=len(close), freq='B')
+    return pd.DataFrame({'Close': close, 'Volume': 1000.0}, index=index)
+
+
+class TestTechnicalIndicators:
+    def test_outputs_columns_without_modifying_input(self, prices):
+        original = prices.copy()
+        result = TechnicalIndicators(prices, CONFIG).calculate_enabled_indicators()
+        assert list(result.columns) == ['Close', 'Volume', *COLUMNS]
+        pd.testing.assert_frame_equal(prices, original)
+
+    def test_matches_pandas(self, prices):
+        result = TechnicalIndicators(prices, CONFIG).calculate_enabled_indicators()
+        close = prices['Close']
+        np.testing.assert_allclose(result['MA_Long'], close.rolling(50).mean(), equal_nan=True)
+        band = close.rolling(20).mean() + 2.0 * close.rolling(20).std()
+        np.testing.assert_allclose(result['BB_Upper'], band, equal_nan=True)
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        np.testing.assert_allclose(result['MACD'], macd, atol=1e-10)
+
+    def test_indicator_block_is_not_copied(self, prices):
+        indicators = TechnicalIndicators(prices, CONFIG)
+        result = indicators.calculate_enabled_indicators()
+        assert np.shares_memory(result['RSI'].to_numpy(), indicators._out)
+        assert np.shares_memory(result['Close'].to_numpy(), prices['Close'].to_numpy())
+
+    def test_keeps_float32_prices(self, prices):
+        prices = prices.astype({'Close': np.float32})
+        result = TechnicalIndicators(prices, CONFIG).calculate_enabled_indicators()
+        assert (result[COLUMNS].dtypes == np.float32).all()
+
+    @pytest.mark.parametrize('numba', [True, False])
+    def test_update_matches_bulk(self, monkeypatch, prices, numba):
+        monkeypatch.setattr(_window_ops, 'NUMBA_AVAILABLE', numba)
+        split = 200
+        bulk = TechnicalIndicators(prices, CONFIG).calculate_enabled_indicators()
+
+        indicators = TechnicalIndicators(prices.iloc[:split], CONFIG)
+        indicators.calculate_enabled_indicators()
+        for timestamp, row in prices.iloc[split:].iterrows():
+            updated = indicators.update(row)
+            assert updated.name == timestamp
+            np.testing.assert_allclose(
+                updated[COLUMNS].to_numpy(dtype=np.float64),
+                bulk.loc[timestamp, COLUMNS].to_numpy(dtype=np.float64),
+                rtol=1e-9
+            )
+
+    def test_update_requires_calculation(self, prices):
+        with pytest.raises(ValueError):
+            TechnicalIndicators(prices, CONFIG).update(prices.iloc[0])
+
+    @pytest.mark.parametrize('gaps', [[], [5, 14], [100], [0, 200, 201]])
+    def test_rsi_state_matches_kernel(self, gaps):
+        rng = np.random.default_rng(2)
+        close = 100 + np.cumsum(rng.normal(0, 1, 300))
+        close[150:180] = close[150]  # Flat stretch: only decays the averages
+        close[gaps] = np.nan
+        state = _RSIState(14)
+        stepped = np.array([state.step(float(price)) for price in close])
+        expected, avg_gain, avg_loss = wilder_rsi(close, 14)
+        np.testing.assert_allclose(stepped, expected, equal_nan=True, rtol=1e-12)
+        assert state.avg_gain == pytest.approx(avg_gain)
+        assert state.avg_loss == pytest.approx(avg_loss)
+
+    def test_sma_state_std_on_large_prices(self):
+        rng = np.random.default_rng(3)
+        close = 3e5 + np.cumsum(rng.normal(0, 1, 500))
+        close[250] = np.nan
+        state = _SMAState.seed(close[:100], 20)
+        stds = []
+        for price in close[100:]:
+            state.step(price)
+            stds.append(state.std())
+        expected = pd.Series(close).rolling(20).std()[100:]
+        np.testing.assert_allclose(stds, expected, equal_nan=True, rtol=1e-5)
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis import _window_ops
+from src.analysis._numba_kernels import macd_kernel, sma_simd, wilder_rsi
+
+
+def _python(kernel):
+    """Uncompiled version of a kernel, as it runs without numba"""
+    return getattr(kernel, 'py_func', kernel)
+
+
+def _prices(n, seed=0, dtype=np.float64):
+    rng = np.random.default_rng(seed)
+    return (100 + np.cumsum(rng.normal(0, 1, n))).astype(dtype)
+
+
+def _wilder_rsi_reference(close, period):
+    """Wilder's RSI via pandas: SMA seed, then ewm(alpha=1/period)"""
+    delta = pd.Series(close, dtype=np.float64).diff()
+    averages = []
+    for part in (delta.clip(lower=0), (-delta).clip(lower=0)):
+        avg = part.copy()
+        avg.iloc[:period + 1] = np.nan
+        avg.iloc[period] = part.iloc[1:period + 1].mean()
+        averages.append(avg.ewm(alpha=1 / period, adjust=False).mean())
+    return (100 - 100 / (1 + averages[0] / averages[1])).to_numpy()
+
+
+class TestWilderRSI:
+    @pytest.mark.parametrize('kernel', [wilder_rsi, _python(wilder_rsi)])
+    def test_matches_pandas(self, kernel):
+        close = _prices(1000)
+        rsi, _, _ = kernel(close, 14)
+        np.testing.assert_allclose(rsi, _wilder_rsi_reference(close, 14), equal_nan=True)
+        assert np.isnan(rsi[:14]).all()
+
+    def test_short_series(self):
+        rsi, avg_gain, avg_loss = wilder_rsi(_prices(10), 14)
+        assert np.isnan(rsi).all()
+        assert np.isnan(avg_gain) and np.isnan(avg_loss)
+
+    @pytest.mark.parametrize('kernel', [wilder_rsi, _python(wilder_rsi)])
+    def test_flat_prices_give_nan(self, kernel):
+        close = np.concatenate([np.full(30, 100.0), 100.0 + np.arange(1, 11)])
+        rsi, _, _ = kernel(close, 14)
+        assert np.isnan(rsi[:30]).all()
+        assert (rsi[30:] == 100.0).all()
+
+    @pytest.mark.parametrize('kernel', [wilder_rsi, _python(wilder_rsi)])
+    def test_nan_price_is_skipped(self, kernel):
+        close = _prices(400)
+        close[100] = np.nan
+        rsi, _, _ = kernel(close, 14)
+        assert np.flatnonzero(np.isnan(rsi[14:])).tolist() == [100 - 14, 101 - 14]
+        assert not (rsi[102:] == 100).all()
+
+    def test_float32_matches_fallback(self):
+        close = _prices(1000, dtype=np.float32)
+        compiled = wilder_rsi(close, 14)
+        fallback = _python(wilder_rsi)(close, 14)
+        assert compiled[0].dtype == np.float32
+        np.testing.assert_allclose(compiled[0], fallback[0], equal_nan=True)
+        assert compiled[1] == pytest.approx(fallback[1])
+
+
+class TestRollingMean:
+    @pytest.mark.parametrize('kernel', [sma_simd, _python(sma_simd)])
+    @pytest.mark.parametrize('window', [1, 20, 50])
+    def test_matches_pandas_across_blocks(self, kernel, window):
+        # Long enough for several 4096-bar blocks of the parallel kernel
+        values = _prices(10000)
+        out = np.empty_like(values)
+        kernel(values, window, out)
+        expected = pd.Series(values).rolling(window).mean().to_numpy()
+        np.testing.assert_allclose(out, expected, equal_nan=True)
+
+    @pytest.mark.parametrize('kernel', [sma_simd, _python(sma_simd)])
+    def test_nan_leaves_window(self, kernel):
+        values = _prices(10000)
+        values[[0, 100, 4094, 4096]] = np.nan
+        out = np.empty_like(values)
+        kernel(values, 20, out)
+        expected = pd.Series(values).rolling(20).mean().to_numpy()
+        np.testing.assert_allclose(out, expected, equal_nan=True)
+
+    def test_window_longer_than_series(self):
+        out = np.empty(10)
+        sma_simd(_prices(10), 20, out)
+        assert np.isnan(out).all()
+
+    @pytest.mark.parametrize('numba', [True, False])
+    def test_rolling_mean_std(self, monkeypatch, numba):
+        monkeypatch.setattr(_window_ops, 'NUMBA_AVAILABLE', numba)
+        values = _prices(500, dtype=np.float32)
+        values[200] = np.nan
+        mean, std = _window_ops.rolling_mean_std(values, 20)
+        expected = pd.Series(values, dtype=np.float64).rolling(20)
+        np.testing.assert_allclose(mean, expected.mean(), equal_nan=True)
+        np.testing.assert_allclose(std, expected.std(), equal_nan=True, rtol=1e-6)
+
+    @pytest.mark.parametrize('numba', [True, False])
+    @pytest.mark.parametrize('level', [5e3, 5e4, 3e5])
+    def test_rolling_std_on_large_prices(self, monkeypatch, numba, level):
+        # E[x^2] - E[x]^2 on raw prices loses most digits at these levels
+        monkeypatch.setattr(_window_ops, 'NUMBA_AVAILABLE', numba)
+        values = level + _prices(20000) - 100
+        _, std = _window_ops.rolling_mean_std(values, 20)
+        expected = pd.Series(values).rolling(20).std()
+        np.testing.assert_allclose(std, expected, equal_nan=True, rtol=1e-5)
+
+
+class TestMACD:
+    ALPHAS = (2 / 13, 2 / 27, 2 / 10)
+
+    @staticmethod
+    def _reference(close):
+        close = pd.Series(close, dtype=np.float64)
+        macd = (close.ewm(span=12, adjust=False).mean()
+                - close.ewm(span=26, adjust=False).mean())
+        return macd.to_numpy(), macd.ewm(span=9, adjust=False).mean().to_numpy()
+
+    @pytest.mark.parametrize('kernel', [macd_kernel, _python(macd_kernel)])
+    @pytest.mark.parametrize('gaps', [[], [0, 1, 100, 200, 201, 202]])
+    def test_matches_pandas(self, kernel, gaps):
+        close = _prices(400)
+        close[gaps] = np.nan
+        macd = np.empty_like(close)
+        signal_line = np.empty_like(close)
+        kernel(close, *self.ALPHAS, macd, signal_line)
+        expected_macd, expected_signal = self._reference(close)
+        np.testing.assert_allclose(macd, expected_macd, equal_nan=True, atol=1e-12)
+        np.testing.assert_allclose(signal_line, expected_signal, equal_nan=True, atol=1e-12)
+
+    def test_float32_matches_fallback(self):
+        close = _prices(1000, dtype=np.float32)
+        results = []
+        for kernel in (macd_kernel, _python(macd_kernel)):
+            macd = np.empty_like(close)
+            signal_line = np.empty_like(close)
+            kernel(close, *self.ALPHAS, macd, signal_line)
+            results.append((macd, signal_line))
+        np.testing.assert_array_equal(results[0][0], results[1][0])
+        np.testing.assert_array_equal(results[0][1], results[1][1])
+
+
+class TestSlidingWeightedMA:
+    @pytest.mark.parametrize('weights', [np.ones(20), np.arange(1, 11), [0.2, 0.3, 0.5]])
+    def test_matches_rolling_apply(self, weights):
+        values = _prices(500)
+        values[100] = np.nan
+        w = np.asarray(weights, dtype=np.float64)
+        expected = pd.Series(values).rolling(len(w)).apply(
+            lambda window: np.dot(window, w) / w.sum(), raw=True)
+        result = _window_ops.sliding_weighted_ma(values, weights)
+        np.testing.assert_allclose(result, expected, equal_nan=True)
+
+    def test_window_longer_than_series(self):
+        assert np.isnan(_window_ops.sliding_weighted_ma(_prices(5), np.ones(10))).all()
+
+    @pytest.mark.parametrize('weights', [[], np.ones((2, 2))])
+    def test_rejects_bad_weights(self, weights):
+        with pytest.raises(ValueError):
+            _window_ops.sliding_weighted_ma(_prices(50), weights)
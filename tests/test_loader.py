@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from src.data.loader import FinancialDataLoader
+from src.data.processor import DataProcessor
+
+ROWS = [
+    '2024-01-02,10.5,11.0,10.0,10.75,10.7,1000',
+    '2024-01-03,10.75,11.5,10.5,11.25,11.2,1500',
+]
+
+
+def _write(directory, ticker, header, rows=ROWS):
+    (directory / f'{ticker}.csv').write_text('\n'.join([header, *rows]) + '\n')
+
+
+class TestFinancialDataLoader:
+    def test_projects_schema_columns(self, tmp_path):
+        _write(tmp_path, 'AAA', 'Date,Open,High,Low,Close,Adj Close,Volume')
+        data = FinancialDataLoader(str(tmp_path)).load_from_csv('AAA')
+        assert list(data.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert data.index.name == 'Date'
+        assert data.index[0] == np.datetime64('2024-01-02')
+
+    def test_normalizes_header_case(self, tmp_path):
+        _write(tmp_path, 'AAA', 'date,open,high,low,close,adj close,volume')
+        data = FinancialDataLoader(str(tmp_path)).load_from_csv('AAA')
+        assert list(data.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert data['Close'].tolist() == [10.75, 11.25]
+
+    def test_missing_column_is_left_to_caller(self, tmp_path):
+        _write(tmp_path, 'AAA', 'Date,Open,High,Low,Close,Adj Close',
+               [row.rsplit(',', 1)[0] for row in ROWS])
+        data = FinancialDataLoader(str(tmp_path)).load_from_csv('AAA')
+        assert 'Volume' not in data.columns
+        assert len(data) == 2
+
+    def test_schema_dtypes(self, tmp_path):
+        _write(tmp_path, 'AAA', 'Date,Open,High,Low,Close,Adj Close,Volume')
+        data = FinancialDataLoader(str(tmp_path)).load_from_csv('AAA')
+        assert (data[['Open', 'High', 'Low', 'Close']].dtypes == np.float32).all()
+        assert data['Volume'].dtype == np.float64
+
+    def test_blank_volume_loads_as_nan(self, tmp_path):
+        _write(tmp_path, 'AAA', 'Date,Open,High,Low,Close,Adj Close,Volume',
+               [ROWS[0], ROWS[1].rsplit(',', 1)[0] + ','])
+        data = FinancialDataLoader(str(tmp_path)).load_from_csv('AAA')
+        assert np.isnan(data['Volume'].iloc[1])
+        assert len(DataProcessor(data).handle_missing_data().get_processed_data()) == 1
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            FinancialDataLoader(str(tmp_path)).load_from_csv('NOPE')
@@ -0,0 +1,117 @@
+import argparse
+import os
+from pathlib import Path
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+from src.main import FinancialAnalysisSystem, parse_arguments
+
+CONFIG = Path(__file__).resolve().parents[1] / 'configs' / 'analysis.yaml'
+
+
+def _write_prices(directory, ticker, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 400)))
+    pd.DataFrame({
+        'Date': pd.date_range('2020-01-01', periods=len(close), freq='B'),
+        'Open': close,
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': 1000
+    }).to_csv(directory / f'{ticker}.csv', index=False)
+
+
+@pytest.fixture
+def args(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for seed, ticker in enumerate(['AAA', 'BBB']):
+        _write_prices(data_dir, ticker, seed)
+    return argparse.Namespace(
+        tickers=['AAA', 'BBB'],
+        config=str(CONFIG),
+        output=str(tmp_path / 'results'),
+        data_dir=str(data_dir),
+        cache_dir=str(tmp_path / 'cache'),
+        no_cache=False,
+        workers=1,
+        verbose=False
+    )
+
+
+class TestPipeline:
+    def test_parses_pipeline_flags(self, monkeypatch):
+        monkeypatch.setattr('sys.argv', ['main', '--tickers', 'AAA', '--workers', '2', '--no-cache'])
+        parsed = parse_arguments()
+        assert parsed.workers == 2
+        assert parsed.no_cache
+        assert parsed.cache_dir == '.cache/indicators'
+
+    def test_buy_and_hold_metrics_use_simple_returns(self, args):
+        system = FinancialAnalysisSystem(args)
+        data = system.data_loader.load_from_csv('AAA')
+        metrics = system._calculate_metrics(data, {})
+        returns = data['Close'].astype(np.float64).pct_change().dropna()
+        assert metrics['total_return'] == pytest.approx((1 + returns).prod() - 1)
+        assert metrics['annualized_return'] == pytest.approx((1 + returns.mean())**252 - 1)
+        assert metrics['kurtosis'] == pytest.approx(returns.kurtosis())
+
+    def test_workers_match_serial_run(self, args):
+        serial = FinancialAnalysisSystem(args).run_pipeline()
+        args.workers = 2
+        parallel = FinancialAnalysisSystem(args).run_pipeline()
+        assert list(parallel) == ['AAA', 'BBB']
+        for ticker in args.tickers:
+            assert parallel[ticker]['metrics'] == pytest.approx(serial[ticker]['metrics'], nan_ok=True)
+            pd.testing.assert_series_equal(parallel[ticker]['backtest']['returns'],
+                                           serial[ticker]['backtest']['returns'])
+
+
+class TestIndicatorCache:
+    def test_second_run_reads_cache(self, args, caplog):
+        system = FinancialAnalysisSystem(args)
+        first = system._process_ticker('AAA')
+        assert len(list(Path(args.cache_dir).glob('AAA_*.parquet'))) == 1
+
+        with caplog.at_level('INFO'):
+            second = system._process_ticker('AAA')
+        assert 'Loaded cached indicators' in caplog.text
+        pd.testing.assert_frame_equal(second['data'], first['data'])
+
+    def test_no_cache_skips_cache(self, args):
+        args.no_cache = True
+        system = FinancialAnalysisSystem(args)
+        assert system._indicator_cache_path('AAA') is None
+        system._process_ticker('AAA')
+        assert not Path(args.cache_dir).exists()
+
+    def test_key_covers_config_data_and_version(self, args, monkeypatch):
+        system = FinancialAnalysisSystem(args)
+        path = system._indicator_cache_path('AAA')
+        assert path == system._indicator_cache_path('AAA')
+        assert path != system._indicator_cache_path('BBB')
+
+        monkeypatch.setattr('src.main.INDICATOR_CACHE_VERSION', -1)
+        assert system._indicator_cache_path('AAA') != path
+        monkeypatch.undo()
+
+        system.config['indicators']['parameters']['rsi']['period'] = 21
+        assert system._indicator_cache_path('AAA') != path
+        system.config['indicators']['parameters']['rsi']['period'] = 14
+
+        raw = Path(args.data_dir) / 'AAA.csv'
+        stat = raw.stat()
+        os.utime(raw, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert system._indicator_cache_path('AAA') != path
+
+    def test_key_covers_module_source(self, args, monkeypatch, tmp_path):
+        source = tmp_path / 'module.py'
+        source.write_text('VERSION = 1\n')
+        monkeypatch.setattr('src.main._INDICATOR_CACHE_MODULES',
+                            (SimpleNamespace(__file__=str(source)),))
+        system = FinancialAnalysisSystem(args)
+        path = system._indicator_cache_path('AAA')
+        source.write_text('VERSION = 2\n')
+        assert system._indicator_cache_path('AAA') != path
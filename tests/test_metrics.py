@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.metrics import FinancialMetrics
+
+
+def _reference(returns, risk_free_rate=0.02, periods_per_year=252):
+    """The original pandas formulas, evaluated metric by metric"""
+    excess = returns - risk_free_rate / periods_per_year
+    downside = returns[returns < 0]
+    cumulative = (1 + returns).cumprod()
+    peak = cumulative.expanding(min_periods=1).max()
+    max_dd = ((cumulative - peak) / peak).min()
+    annualized = (1 + returns.mean())**periods_per_year - 1
+    gross_losses = abs(returns[returns < 0].sum())
+    return {
+        'total_return': (1 + returns).prod() - 1,
+        'annualized_return': annualized,
+        'annualized_volatility': returns.std() * np.sqrt(periods_per_year),
+        'sharpe_ratio': excess.mean() / excess.std() * np.sqrt(periods_per_year),
+        'sortino_ratio': (excess.mean() / downside.std() * np.sqrt(periods_per_year)
+                          if len(downside) else np.nan),
+        'max_drawdown': max_dd,
+        'calmar_ratio': annualized / abs(max_dd) if max_dd != 0 else np.nan,
+        'win_rate': (returns > 0).mean(),
+        'profit_factor': (returns[returns > 0].sum() / gross_losses
+                          if gross_losses != 0 else np.inf),
+        'skewness': returns.skew(),
+        'kurtosis': returns.kurtosis()
+    }
+
+
+def _returns(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(rng.normal(0.0005, 0.01, n),
+                     index=pd.date_range('2020-01-01', periods=n, freq='B'))
+
+
+class TestFinancialMetrics:
+    @pytest.mark.filterwarnings('ignore:divide by zero:RuntimeWarning')
+    @pytest.mark.parametrize('returns', [
+        _returns(),
+        _returns(50, seed=1).abs(),           # No losses
+        pd.Series([0.01, -0.02, np.nan, 0.03]),
+        pd.Series(np.zeros(10))                # Zero volatility
+    ])
+    def test_matches_pandas_formulas(self, returns):
+        metrics = FinancialMetrics(returns).calculate_all()
+        expected = _reference(returns.dropna())
+        assert metrics.keys() == expected.keys()
+        for name, value in expected.items():
+            assert metrics[name] == pytest.approx(value, rel=1e-9, nan_ok=True), name
+
+    def test_methods_match_calculate_all(self):
+        metrics = FinancialMetrics(_returns())
+        assert metrics.sharpe_ratio() == metrics.calculate_all()['sharpe_ratio']
+        assert metrics.calmar_ratio(12) == pytest.approx(
+            metrics.annualized_return(12) / abs(metrics.max_drawdown()))
+
+    @pytest.mark.parametrize('returns', [
+        [0.1, -0.2, 0.05, -0.1, 0.3],
+        [-0.05, 0.02, np.nan, -0.01],
+        [0.01, 0.02, 0.03]
+    ])
+    def test_max_drawdown_matches_expanding_max(self, returns):
+        returns = pd.Series(returns)
+        cumulative = (1 + returns.dropna()).cumprod()
+        peak = cumulative.expanding(min_periods=1).max()
+        expected = ((cumulative - peak) / peak).min()
+        assert FinancialMetrics(returns).max_drawdown() == pytest.approx(expected)
+
+    def test_dataframe_matches_per_column(self):
+        returns = pd.DataFrame({'a': _returns(seed=2), 'b': _returns(seed=3).abs(), 'c': 0.0})
+        returns.iloc[0] = np.nan  # Shared leading gap, as in backtest returns
+        with np.errstate(divide='ignore', invalid='ignore'):
+            metrics = pd.DataFrame(FinancialMetrics(returns).calculate_all())
+            for column in returns.columns:
+                expected = FinancialMetrics(returns[column]).calculate_all()
+                assert metrics.loc[column].to_dict() == pytest.approx(expected, nan_ok=True)
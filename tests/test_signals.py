@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.trading._numba_kernels import _combine_signals
+from src.trading.signals import (
+    SIGNAL_CATEGORIES, SIMPLE_SIGNAL_CATEGORIES, SignalConfig, SignalGenerator, SignalType,
+    simple_signal_codes
+)
+
+ALL_ENABLED = {'rsi': True, 'moving_average': True, 'bollinger': True, 'macd': True}
+
+PARAMETERS = {
+    'rsi': {'period': 14, 'overbought': 70, 'oversold': 30},
+    'moving_average': {'short_window': 20, 'long_window': 50},
+    'bollinger': {'window': 20, 'std_dev': 2.0},
+    'macd': {'fast_period': 12, 'slow_period': 26, 'signal_period': 9}
+}
+
+
+def _generator(enabled, n=5000, seed=0):
+    """Generator whose indicator columns are replaced by noisy synthetic ones"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2000-01-01', periods=n, freq='B')
+    data = pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(0, 1, n))}, index=index)
+    generator = SignalGenerator(data, SignalConfig(enabled=enabled, parameters=PARAMETERS))
+    # Crosses, RSI extremes and band breaks on a large share of bars, so
+    # that STRONG_* signals (all four conditions at once) occur too
+    generator.data = data.assign(
+        MA_Short=rng.normal(0, 1, n), MA_Long=rng.normal(0, 1, n),
+        RSI=rng.uniform(0, 100, n),
+        BB_Upper=data['Close'] + rng.normal(0.5, 1, n),
+        BB_Lower=data['Close'] - rng.normal(0.5, 1, n),
+        MACD=rng.normal(0, 1, n), Signal_Line=rng.normal(0, 1, n)
+    )
+    generator.data.iloc[:30, 1:] = np.nan  # Indicator warm-up
+    return generator
+
+
+def _reference(data, enabled):
+    """The original pandas rule chain, assigned in the same order"""
+    signals = pd.Series(SignalType.NEUTRAL, index=data.index, name='Signal')
+    ma_above = ma_below = rsi_high = rsi_low = bb_below = bb_above = macd_above = macd_below = False
+    if enabled.get('moving_average', False):
+        ma_above = (data['MA_Short'] > data['MA_Long']) & \
+                   (data['MA_Short'].shift(1) <= data['MA_Long'].shift(1))
+        ma_below = (data['MA_Short'] < data['MA_Long']) & \
+                   (data['MA_Short'].shift(1) >= data['MA_Long'].shift(1))
+    if enabled.get('rsi', False):
+        rsi_high = data['RSI'] > PARAMETERS['rsi']['overbought']
+        rsi_low = data['RSI'] < PARAMETERS['rsi']['oversold']
+    if enabled.get('bollinger', False):
+        bb_below = data['Close'] < data['BB_Lower']
+        bb_above = data['Close'] > data['BB_Upper']
+    if enabled.get('macd', False):
+        macd_above = (data['MACD'] > data['Signal_Line']) & \
+                     (data['MACD'].shift(1) <= data['Signal_Line'].shift(1))
+        macd_below = (data['MACD'] < data['Signal_Line']) & \
+                     (data['MACD'].shift(1) >= data['Signal_Line'].shift(1))
+
+    strong_buy = ma_above & rsi_low & bb_below & macd_above
+    strong_sell = ma_below & rsi_high & bb_above & macd_below
+    buy = ma_above | macd_above
+    sell = ma_below | macd_below
+    signals.loc[strong_buy] = SignalType.STRONG_BUY
+    signals.loc[strong_sell] = SignalType.STRONG_SELL
+    signals.loc[buy & ~strong_buy] = SignalType.BUY
+    signals.loc[sell & ~strong_sell] = SignalType.SELL
+    return signals.map(lambda signal: signal.name)
+
+
+class TestGenerateSignals:
+    @pytest.mark.parametrize('enabled', [
+        ALL_ENABLED,
+        {**ALL_ENABLED, 'rsi': False, 'bollinger': False},
+        {**ALL_ENABLED, 'macd': False},
+        {'rsi': True}
+    ])
+    def test_matches_pandas_rules(self, enabled):
+        generator = _generator(enabled)
+        signals = generator.generate_signals()
+        expected = _reference(generator.data, enabled)
+        assert signals.name == 'Signal'
+        assert list(signals.cat.categories) == SIGNAL_CATEGORIES
+        pd.testing.assert_series_equal(signals.astype(str), expected, check_dtype=False)
+
+    def test_strong_signals_occur(self):
+        counts = _generator(ALL_ENABLED).generate_signals().value_counts()
+        assert (counts[SIGNAL_CATEGORIES] > 0).all()
+
+    def test_compiled_matches_fallback(self):
+        data = _generator(ALL_ENABLED).data
+        args = [data[name].to_numpy() for name in
+                ('MA_Short', 'MA_Long', 'RSI', 'Close', 'BB_Upper', 'BB_Lower', 'MACD', 'Signal_Line')]
+        args += [70.0, 30.0, True, True, True, True]
+        fallback = getattr(_combine_signals, 'py_func', _combine_signals)
+        np.testing.assert_array_equal(_combine_signals(*args), fallback(*args))
+
+
+class TestSimpleSignalCodes:
+    NAMES = ['STRONG_SELL', 'SELL', 'NEUTRAL', 'BUY', 'STRONG_BUY']
+
+    @pytest.mark.parametrize('signals', [
+        pd.Series(pd.Categorical(NAMES, categories=SIGNAL_CATEGORIES)),
+        pd.Series([SignalType[name] for name in NAMES]),
+        pd.Series(NAMES)
+    ])
+    def test_collapses_strong_signals(self, signals):
+        codes = simple_signal_codes(signals)
+        assert codes.dtype == np.int8
+        expected = [SignalType[name].simple_name for name in self.NAMES]
+        assert [SIMPLE_SIGNAL_CATEGORIES[code] for code in codes] == expected
+
+    @pytest.mark.parametrize('signals', [
+        pd.Series(pd.Categorical(['BUY', np.nan, 'SELL'], categories=SIGNAL_CATEGORIES)),
+        pd.Series(['BUY', None, 'SELL']),
+        pd.Series(['BUY', 'HOLD', 'SELL'])
+    ])
+    def test_missing_and_unknown_are_minus_one(self, signals):
+        assert simple_signal_codes(signals).tolist() == [2, -1, 0]